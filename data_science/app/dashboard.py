@@ -15,8 +15,9 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.data_generator import generate_aqi_data, generate_outage_data, generate_traffic_data
+from utils.data_sources import get_data_source
 from utils.predictors import AQIPredictor, OutagePredictor, ImageClassifier
+from utils.monitoring import ModelMonitor, FeatureDriftMonitor
 
 # Page configuration
 st.set_page_config(
@@ -52,11 +53,34 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def load_data_source():
+    # One data source (and SQLite connection pool) shared by all sessions
+    return get_data_source()
+
+CURRENT_DAYS = 7       # monitored window
+REFERENCE_DAYS = 30    # training baseline, ending where the monitored window starts
+
+@st.cache_resource
+def load_drift_reference():
+    # Fitted once per server, not per session, and disjoint from the current window
+    current_start = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=CURRENT_DAYS)
+    baseline = FeatureDriftMonitor()
+    for zone in ["Zone-A", "Zone-B", "Zone-C", "Zone-D"]:
+        baseline.fit_reference(load_data_source().aqi(
+            zone=zone, start=current_start - timedelta(days=REFERENCE_DAYS), end=current_start))
+    return baseline.reference
+
 # Initialize session state
 if 'initialized' not in st.session_state:
+    st.session_state.data_source = load_data_source()
     st.session_state.aqi_predictor = AQIPredictor()
     st.session_state.outage_predictor = OutagePredictor()
     st.session_state.image_classifier = ImageClassifier()
+
+    # Labels are simulated, so only feature drift can trigger retraining
+    st.session_state.monitor = ModelMonitor(simulated_labels=True, drift_reference=load_drift_reference())
+    st.session_state.monitored_batches = set()
     st.session_state.initialized = True
 
 # Header
@@ -92,8 +116,16 @@ with tab1:
         zones = ["Zone-A (Downtown)", "Zone-B (Industrial)", "Zone-C (Residential)", "Zone-D (Suburban)"]
         selected_zone = st.selectbox("City Zone", zones, key="aqi_zone")
 
-        # Generate AQI data
-        aqi_data = generate_aqi_data(zone=selected_zone.split()[0])
+        # Load AQI data
+        aqi_data = st.session_state.data_source.aqi(zone=selected_zone.split()[0], days=CURRENT_DAYS)
+
+        # Feed each batch to the monitor once. No labelled data exists yet, so
+        # next-hour risk stands in as simulated ground truth
+        if ('aqi', selected_zone) not in st.session_state.monitored_batches:
+            risk = [st.session_state.aqi_predictor.predict(v)['risk_level'] for v in aqi_data['pm25']]
+            st.session_state.monitor.aqi.update(risk[:-1], risk[1:])
+            st.session_state.monitor.drift.update(aqi_data)
+            st.session_state.monitored_batches.add(('aqi', selected_zone))
 
         # Time series plot
         fig = go.Figure()
@@ -179,8 +211,18 @@ with tab2:
     with col1:
         st.subheader("📋 Active Outages")
 
-        # Generate outage data
-        outage_data = generate_outage_data()
+        # Load outage data
+        outage_data = st.session_state.data_source.outages()
+
+        # No observed restoration times exist yet; the generator's ETA for
+        # resolved outages stands in as simulated ground truth
+        if ('outage',) not in st.session_state.monitored_batches:
+            resolved = outage_data[outage_data['status'] == "Resolved"]
+            predicted = [st.session_state.outage_predictor.predict(row.cause, row.zone)['eta_hours']
+                         for row in resolved.itertuples(index=False)]
+            actual = resolved['predicted_eta'].str.split().str[0].astype(float)
+            st.session_state.monitor.outage.update(predicted, actual)
+            st.session_state.monitored_batches.add(('outage',))
 
         # Display outages table
         st.dataframe(
@@ -225,16 +267,41 @@ with tab2:
             upper = prediction['eta_hours'] * 1.2
             st.markdown(f"**95% Confidence Interval**: {lower:.1f}h - {upper:.1f}h")
 
-    # Historical performance
+    # Streaming performance, recomputed as (simulated) ground truth arrives
     st.subheader("📈 Model Performance Metrics")
+    st.caption("⚠️ Simulated labels: AQI accuracy compares each hour's predicted risk with the "
+               "next hour's, and outage error uses the synthetic ETA of resolved outages. "
+               "These are not real model accuracy figures and never trigger retraining; "
+               "retrain warnings below come from input drift only.")
+    monitor = st.session_state.monitor
     col3, col4, col5 = st.columns(3)
 
     with col3:
-        st.metric("Model Accuracy", "87.3%", delta="2.1%")
+        accuracy = monitor.aqi.accuracy
+        st.metric("AQI Accuracy (simulated)", f"{accuracy*100:.1f}%" if accuracy is not None else "n/a",
+                  help=f"{monitor.aqi.count} simulated labels")
     with col4:
-        st.metric("Mean Absolute Error", "1.2 hours", delta="-0.3h")
+        mae = monitor.outage.mae
+        st.metric("Outage MAE (simulated)", f"{mae:.1f} hours" if mae is not None else "n/a",
+                  help=f"{monitor.outage.count} resolved outages")
     with col5:
-        st.metric("R² Score", "0.82", delta="0.05")
+        r2 = monitor.outage.r2
+        st.metric("Outage R² (simulated)", f"{r2:.2f}" if r2 is not None else "n/a")
+
+    # Input drift against each zone's training distribution
+    drift = monitor.drift.summary()
+    if drift:
+        drift_table = pd.DataFrame([
+            {'Zone': zone, 'Feature': feature, 'PSI': stats['psi'], 'KS': stats['ks'], 'Samples': stats['samples']}
+            for zone, features in drift.items() for feature, stats in features.items()
+        ])
+        st.dataframe(drift_table.round(3), use_container_width=True, hide_index=True)
+
+    signals = monitor.retrain_signals()
+    for model, reasons in signals.items():
+        st.warning(f"🔁 **Retrain {model.upper()} model**: " + "; ".join(reasons))
+    if not signals:
+        st.success("✅ No retraining required")
 
 # TAB 3: Civic Reporting
 with tab3:
@@ -315,8 +382,8 @@ with tab3:
 with tab4:
     st.header("🚗 Traffic Analysis & Route Optimization")
 
-    # Generate traffic data
-    traffic_data = generate_traffic_data()
+    # Load traffic data
+    traffic_data = st.session_state.data_source.traffic()
 
     col1, col2 = st.columns([3, 2])
 
@@ -0,0 +1,60 @@
+"""
+Data source benchmark
+Compares the synthetic and SQLite backends on AQI queries
+
+Usage: python benchmarks/data_source_benchmark.py [num_rows]
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_sources import SyntheticDataSource, SQLiteDataSource
+
+ZONES = ["Zone-A", "Zone-B", "Zone-C", "Zone-D"]
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s  {len(result):>12,} rows")
+    return result
+
+
+def run_benchmark(num_rows=10_000_000):
+    """
+    Load `num_rows` hourly AQI readings split across zones into SQLite, then
+    time full-history, last-week and repeated (cached) queries on both backends
+    """
+    days = max(num_rows // (len(ZONES) * 24), 1)
+    synthetic = SyntheticDataSource()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = SQLiteDataSource(os.path.join(tmp, "cityassist.db"), create=True)
+
+        print(f"Loading {days * 24 * len(ZONES):,} AQI rows into SQLite...")
+        start = time.perf_counter()
+        for zone in ZONES:
+            database.write('aqi', synthetic.aqi(zone=zone, days=days))
+        print(f"Load time: {time.perf_counter() - start:.1f}s\n")
+
+        for name, source in [("synthetic", synthetic), ("sqlite", database)]:
+            timed(f"{name}: full history, all zones",
+                  lambda: pd.concat([source.aqi(zone=zone, days=days) for zone in ZONES]))
+            timed(f"{name}: last 7 days, all zones",
+                  lambda: pd.concat([source.aqi(zone=zone, days=7) for zone in ZONES]))
+            timed(f"{name}: last 7 days, repeated",
+                  lambda: source.aqi(zone="Zone-A", days=7))
+
+        database.close()
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
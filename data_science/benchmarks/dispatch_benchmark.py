@@ -0,0 +1,125 @@
+"""
+Dispatch scheduler benchmark
+Replays a generated week of civic reports through DispatchQueue hour by hour
+
+Usage: python benchmarks/dispatch_benchmark.py [num_reports]
+"""
+
+import sys
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_generator import generate_civic_reports
+from utils.dispatcher import DispatchQueue, PRIORITY_RANK, TIME_FORMAT
+
+CREWS_PER_ZONE = {"Zone-A": 40, "Zone-B": 30, "Zone-C": 25, "Zone-D": 15}
+
+
+def check_ordering(num_ops=5_000, seed=42):
+    """
+    Random push/update/cancel/assign/pop run checked against a sorted reference
+    """
+    rand = random.Random(seed)
+    priorities = list(PRIORITY_RANK)
+    zones = list(CREWS_PER_ZONE)
+    queue = DispatchQueue()
+    expected = {}   # item id -> (rank, reported time, eta, zone)
+
+    def random_item():
+        return (rand.choice(priorities), rand.randint(0, 10**6), rand.random() * 5, rand.choice(zones))
+
+    def order(item_id):
+        priority, reported, eta, _ = expected[item_id]
+        return PRIORITY_RANK[priority], reported, eta
+
+    for item_id in range(num_ops):
+        priority, reported, eta, zone = expected[item_id] = random_item()
+        queue.push(item_id, priority, reported, zone, eta_hours=eta)
+    for item_id in rand.sample(range(num_ops), num_ops // 5):
+        queue.cancel(item_id)
+        del expected[item_id]
+    for item_id in rand.sample(sorted(expected), num_ops // 5):
+        priority, reported, eta, zone = expected[item_id] = random_item()
+        queue.update(item_id, priority, reported, zone, eta_hours=eta)
+
+    crews = {"Zone-A": 3, "Zone-C": 2, "Zone-X": 5}
+    wanted = []
+    for zone, count in crews.items():
+        wanted += sorted((i for i in expected if expected[i][3] == zone), key=order)[:count]
+    assigned = [item_id for item_id, _ in queue.assign_crews(crews)]
+    assert assigned == sorted(wanted, key=order), "assign_crews picked the wrong items"
+    for item_id in assigned:
+        del expected[item_id]
+
+    popped = []
+    while queue:
+        popped.append(queue.pop()[0])
+    assert popped == sorted(expected, key=order), "pop order does not match priority order"
+    print(f"Ordering check passed ({num_ops:,} items)")
+
+
+def replay(reports, rng):
+    """
+    Push every report in timestamp order, re-prioritise and cancel a share
+    of them, and run greedy crew assignment once per simulated hour
+    """
+    queue = DispatchQueue(max_items=len(reports))
+    counts = {'push': 0, 'update': 0, 'cancel': 0, 'assigned': 0}
+
+    for hour, batch in reports.groupby('timestamp', sort=True):
+        reported = datetime.strptime(hour, TIME_FORMAT).timestamp()
+        for row in batch.itertuples(index=False):
+            queue.push(row.report_id, row.priority, reported, row.zone)
+            counts['push'] += 1
+
+            # Some reports get escalated or resolved before a crew arrives
+            roll = rng.random()
+            if roll < 0.05:
+                queue.update(row.report_id, "High", reported, row.zone)
+                counts['update'] += 1
+            elif roll < 0.08:
+                queue.cancel(row.report_id)
+                counts['cancel'] += 1
+
+        counts['assigned'] += len(queue.assign_crews(CREWS_PER_ZONE))
+
+    return queue, counts
+
+
+def run_benchmark(num_reports=1_000_000):
+    check_ordering()
+
+    print(f"Generating {num_reports:,} civic reports over one week...")
+    reports = generate_civic_reports(num_reports=num_reports)
+    reports = reports.sort_values('timestamp')
+
+    # Timed pass, without tracemalloc slowing down every allocation
+    start = time.perf_counter()
+    queue, counts = replay(reports, np.random.default_rng(42))
+    elapsed = time.perf_counter() - start
+
+    ops = counts['push'] + counts['update'] + counts['cancel'] + counts['assigned']
+    print(f"Operations: {counts}")
+    print(f"Open items remaining: {len(queue):,}")
+    print(f"Elapsed: {elapsed:.2f}s ({ops / elapsed:,.0f} ops/s)")
+    del queue
+
+    # Separate pass for memory
+    tracemalloc.start()
+    queue, _ = replay(reports, np.random.default_rng(42))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Peak traced memory: {peak / 1e6:.1f} MB")
+    print(f"Retained per open item: {current / max(len(queue), 1):,.0f} bytes")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,257 @@
+"""
+Data sources for CityAssist
+A common interface over the synthetic generators and a SQLite database
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from utils.data_generator import generate_aqi_data, generate_outage_data, generate_traffic_data
+
+TIME_FORMAT = "%Y-%m-%d %H:%M"
+REQUIRED_TABLES = {'aqi', 'outages', 'traffic'}
+
+
+def _format_time(value):
+    if value is None or isinstance(value, str):
+        return value
+    return value.strftime(TIME_FORMAT)
+
+
+def _window_start(days, start):
+    # Default window starts on the hour so cache keys are stable within an hour
+    if start is not None:
+        return _format_time(start)
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    return (now - timedelta(days=days)).strftime(TIME_FORMAT)
+
+
+class DataSource(ABC):
+    """
+    Interface used by the dashboard and notebooks to load city data
+    """
+
+    @abstractmethod
+    def aqi(self, zone="Zone-A", days=7, start=None, end=None):
+        """
+        Hourly PM2.5/PM10 readings for a zone with start <= timestamp < end
+
+        `start` defaults to `days` days before the current hour and `end`
+        to no upper bound. Both accept datetimes or "%Y-%m-%d %H:%M" strings.
+        """
+
+    @abstractmethod
+    def outages(self, limit=15, zone=None, start=None, end=None):
+        """
+        Up to `limit` utility outage records in the order they were recorded,
+        optionally for one zone and with start <= reported_time < end
+        """
+
+    @abstractmethod
+    def traffic(self):
+        """
+        Hourly congestion and travel time per route
+        """
+
+
+class SyntheticDataSource(DataSource):
+    """
+    Backed by the synthetic generators in utils.data_generator
+    """
+
+    def aqi(self, zone="Zone-A", days=7, start=None, end=None):
+        if start is None and end is None:
+            return generate_aqi_data(zone=zone, days=days)
+
+        start = pd.Timestamp(_window_start(days, start))
+        span = datetime.now() - start.to_pydatetime()
+        data = generate_aqi_data(zone=zone, days=max(span.days + 1, 1))
+        mask = data['timestamp'] >= start
+        if end is not None:
+            mask &= data['timestamp'] < pd.Timestamp(_format_time(end))
+        return data[mask].reset_index(drop=True)
+
+    def outages(self, limit=15, zone=None, start=None, end=None):
+        if zone is None and start is None and end is None:
+            return generate_outage_data(num_outages=limit)
+
+        # Generate more records until `limit` match the filters, like SQL's
+        # WHERE ... LIMIT (the generator is seeded, so earlier rows are stable)
+        start, end = _format_time(start), _format_time(end)
+        num_outages = limit * 4
+        while True:
+            data = generate_outage_data(num_outages=num_outages)
+            if zone is not None:
+                data = data[data['zone'] == zone]
+            if start is not None:
+                data = data[data['reported_time'] >= start]
+            if end is not None:
+                data = data[data['reported_time'] < end]
+            if len(data) >= limit or data.empty:
+                return data.head(limit).reset_index(drop=True)
+            num_outages *= 2
+
+    def traffic(self):
+        return generate_traffic_data()
+
+
+class SQLiteDataSource(DataSource):
+    """
+    Backed by a SQLite database with `aqi`, `outages` and `traffic` tables
+
+    Connections come from a fixed-size pool, queries are parameterized,
+    rows are fetched in batches and results are cached per query and
+    data version. The version is SQLite's `PRAGMA data_version` on a
+    dedicated connection, so commits from any other connection or process
+    invalidate the cache.
+    """
+
+    AQI_QUERY = "SELECT timestamp, pm25, pm10, zone, hour FROM aqi WHERE {where} ORDER BY timestamp"
+    OUTAGE_QUERY = ("SELECT outage_id, zone, cause, reported_time, predicted_eta, status, "
+                    "affected_customers FROM outages WHERE {where} ORDER BY rowid LIMIT ?")
+    TRAFFIC_QUERY = ("SELECT route, hour, congestion_level, travel_time, volume FROM traffic "
+                     "ORDER BY route, hour")
+
+    def __init__(self, path, pool_size=4, batch_size=50_000, cache_size=32, create=False):
+        """
+        Open an existing database with all required tables, or a new empty
+        one when `create` is True (tables are then added through write())
+        """
+        if not create and not os.path.exists(path):
+            raise FileNotFoundError(f"CityAssist database not found: {path}")
+        # mode=rw never creates a file; mode=rwc does
+        self._uri = f"{Path(path).resolve().as_uri()}?mode={'rwc' if create else 'rw'}"
+        self.path = path
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._version_conn = self._connect()
+        self._version_lock = threading.Lock()
+        self._pool = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            conn = self._connect()
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._pool.put(conn)
+
+        if not create:
+            missing = REQUIRED_TABLES - self._tables()
+            if missing:
+                self.close()
+                raise ValueError(f"CityAssist database {path} is missing tables: {', '.join(sorted(missing))}")
+        self._create_indexes()
+
+    def _connect(self):
+        return sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+
+    def _tables(self):
+        with self.connection() as conn:
+            return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+        self._version_conn.close()
+
+    def data_version(self):
+        with self._version_lock:
+            return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def write(self, table, data):
+        """
+        Append a DataFrame to a table and invalidate cached results
+        """
+        with self.connection() as conn:
+            data.to_sql(table, conn, if_exists='append', index=False)
+            conn.commit()
+        self._create_indexes()
+
+    def _create_indexes(self):
+        tables = self._tables()
+        with self.connection() as conn:
+            if 'aqi' in tables:
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_aqi_zone_time ON aqi (zone, timestamp)")
+            if 'outages' in tables:
+                # rowid is implicitly part of the index, so zone filters stay in insertion order
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_outages_zone_rowid ON outages (zone)")
+            conn.commit()
+
+    def _query(self, sql, params=()):
+        key = (sql, params, self.data_version())
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key].copy()
+
+        with self.connection() as conn:
+            cursor = conn.execute(sql, params)
+            columns = [col[0] for col in cursor.description]
+            batches = []
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    break
+                batches.append(pd.DataFrame.from_records(rows, columns=columns))
+
+        result = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=columns)
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result.copy()
+
+    @staticmethod
+    def _where(filters):
+        # Build a parameterized WHERE clause from (condition, value) pairs,
+        # skipping filters whose value is None
+        active = [(condition, value) for condition, value in filters if value is not None]
+        clause = " AND ".join(condition for condition, _ in active) or "1 = 1"
+        return clause, tuple(value for _, value in active)
+
+    def aqi(self, zone="Zone-A", days=7, start=None, end=None):
+        where, params = self._where([
+            ("zone = ?", zone),
+            ("timestamp >= ?", _window_start(days, start)),
+            ("timestamp < ?", _format_time(end))
+        ])
+        data = self._query(self.AQI_QUERY.format(where=where), params)
+        data['timestamp'] = pd.to_datetime(data['timestamp'])
+        return data
+
+    def outages(self, limit=15, zone=None, start=None, end=None):
+        where, params = self._where([
+            ("zone = ?", zone),
+            ("reported_time >= ?", _format_time(start)),
+            ("reported_time < ?", _format_time(end))
+        ])
+        return self._query(self.OUTAGE_QUERY.format(where=where), params + (limit,))
+
+    def traffic(self):
+        return self._query(self.TRAFFIC_QUERY)
+
+
+def get_data_source():
+    """
+    SQLite database at $CITYASSIST_DB if set, otherwise synthetic data
+    """
+    path = os.environ.get("CITYASSIST_DB")
+    if path:
+        return SQLiteDataSource(path)
+    return SyntheticDataSource()
@@ -0,0 +1,250 @@
+"""
+Model drift and data-quality monitoring for CityAssist
+Streaming accuracy/MAE and feature drift (PSI, KS) kept in fixed memory
+"""
+
+import numpy as np
+
+# Fixed bin ranges for monitored input features
+FEATURE_BINS = {
+    'pm25': np.linspace(0, 400, 41),
+    'pm10': np.linspace(0, 600, 41),
+    'hour': np.arange(0, 25)
+}
+
+# Retrain thresholds
+PSI_THRESHOLD = 0.2          # > 0.2 is a significant population shift
+KS_THRESHOLD = 0.1
+MIN_ACCURACY = 0.80
+MAX_MAE_HOURS = 2.0
+MIN_SAMPLES = 50
+CURRENT_HALF_LIFE = 24 * 7   # samples; recent week of hourly readings dominates
+
+
+class StreamingHistogram:
+    """
+    Fixed-bin histogram of a feature, updated batch by batch
+
+    Values outside the bin range are counted in the first/last bin, so
+    memory stays constant however much data is seen. With a `half_life`
+    (in samples) older counts decay exponentially, so the histogram tracks
+    a rolling window instead of the whole history.
+    """
+
+    def __init__(self, edges, half_life=None):
+        self.edges = np.asarray(edges, dtype=float)
+        self.half_life = half_life
+        self.counts = np.zeros(len(self.edges) - 1)
+
+    @property
+    def total(self):
+        return float(self.counts.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if self.half_life:
+            self.counts *= 0.5 ** (len(values) / self.half_life)
+        index = np.searchsorted(self.edges, values, side='right') - 1
+        index = np.clip(index, 0, len(self.counts) - 1)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+
+    def reset(self):
+        self.counts[:] = 0
+
+    def proportions(self, eps=1e-6):
+        if self.total == 0:
+            return np.zeros(len(self.counts))
+        return np.maximum(self.counts / self.total, eps)
+
+    def cdf(self):
+        if self.total == 0:
+            return np.zeros(len(self.counts))
+        return np.cumsum(self.counts) / self.total
+
+
+def population_stability_index(reference, current):
+    """
+    PSI between two histograms sharing the same bins
+    """
+    ref = reference.proportions()
+    cur = current.proportions()
+    return float(np.sum((cur - ref) * np.log(cur / ref)))
+
+
+def ks_statistic(reference, current):
+    """
+    Kolmogorov-Smirnov statistic, evaluated at the shared bin edges
+    """
+    return float(np.max(np.abs(reference.cdf() - current.cdf())))
+
+
+class FeatureDriftMonitor:
+    """
+    Compares incoming feature distributions against a reference window
+
+    Histograms are kept per segment (zone by default) so each zone is only
+    compared with its own reference. Current histograms decay with
+    `half_life` so drift after a long stable period is not diluted.
+    A `reference` fitted once elsewhere can be shared between monitors.
+    """
+
+    def __init__(self, feature_bins=None, segment='zone', half_life=CURRENT_HALF_LIFE, reference=None):
+        self.feature_bins = feature_bins or FEATURE_BINS
+        self.segment = segment
+        self.half_life = half_life
+        self.reference = reference if reference is not None else {}   # segment -> feature -> StreamingHistogram
+        self.current = {}
+
+    def _histograms(self, store, segment, half_life=None):
+        if segment not in store:
+            store[segment] = {f: StreamingHistogram(e, half_life) for f, e in self.feature_bins.items()}
+        return store[segment]
+
+    def _split(self, data):
+        if self.segment in data:
+            return data.groupby(self.segment)
+        return [(None, data)]
+
+    def fit_reference(self, data):
+        """
+        Add a batch (DataFrame) to the reference (training) distribution
+        """
+        for segment, batch in self._split(data):
+            for feature, hist in self._histograms(self.reference, segment).items():
+                if feature in batch:
+                    hist.update(batch[feature])
+
+    def update(self, data):
+        """
+        Add a batch (DataFrame) of incoming data
+        """
+        for segment, batch in self._split(data):
+            for feature, hist in self._histograms(self.current, segment, self.half_life).items():
+                if feature in batch:
+                    hist.update(batch[feature])
+
+    def reset_current(self, segment=None):
+        """
+        Clear the current window for one segment, or all of them
+        """
+        for seg, histograms in self.current.items():
+            if segment is None or seg == segment:
+                for hist in histograms.values():
+                    hist.reset()
+
+    def summary(self):
+        """
+        PSI and KS per segment and feature
+        """
+        results = {}
+        for segment, current in self.current.items():
+            reference = self.reference.get(segment)
+            if reference is None:
+                continue
+            for feature, cur in current.items():
+                ref = reference[feature]
+                if ref.total == 0 or cur.total == 0:
+                    continue
+                results.setdefault(segment, {})[feature] = {
+                    'psi': population_stability_index(ref, cur),
+                    'ks': ks_statistic(ref, cur),
+                    'samples': cur.total
+                }
+        return results
+
+
+class ClassifierMonitor:
+    """
+    Streaming accuracy for a classifier as ground truth arrives
+
+    With `simulated=True` the labels are stand-ins, so the accuracy is shown
+    but never used to trigger retraining.
+    """
+
+    def __init__(self, simulated=False):
+        self.simulated = simulated
+        self.count = 0
+        self.correct = 0
+
+    def update(self, predicted, actual):
+        predicted = np.asarray(predicted)
+        actual = np.asarray(actual)
+        self.count += len(actual)
+        self.correct += int(np.sum(predicted == actual))
+
+    @property
+    def accuracy(self):
+        return self.correct / self.count if self.count else None
+
+
+class RegressorMonitor:
+    """
+    Streaming MAE and R² for a regressor as ground truth arrives
+
+    With `simulated=True` the labels are stand-ins, so the errors are shown
+    but never used to trigger retraining.
+    """
+
+    def __init__(self, simulated=False):
+        self.simulated = simulated
+        self.count = 0
+        self.abs_error = 0.0
+        self.sq_error = 0.0
+        self.sum_y = 0.0
+        self.sum_y2 = 0.0
+
+    def update(self, predicted, actual):
+        predicted = np.asarray(predicted, dtype=float)
+        actual = np.asarray(actual, dtype=float)
+        error = predicted - actual
+        self.count += len(actual)
+        self.abs_error += float(np.sum(np.abs(error)))
+        self.sq_error += float(np.sum(error ** 2))
+        self.sum_y += float(np.sum(actual))
+        self.sum_y2 += float(np.sum(actual ** 2))
+
+    @property
+    def mae(self):
+        return self.abs_error / self.count if self.count else None
+
+    @property
+    def r2(self):
+        if self.count < 2:
+            return None
+        total = self.sum_y2 - self.sum_y ** 2 / self.count
+        return 1 - self.sq_error / total if total > 0 else None
+
+
+class ModelMonitor:
+    """
+    Performance and drift monitor for the AQI and outage models
+    """
+
+    def __init__(self, simulated_labels=False, drift_reference=None):
+        self.aqi = ClassifierMonitor(simulated=simulated_labels)
+        self.outage = RegressorMonitor(simulated=simulated_labels)
+        self.drift = FeatureDriftMonitor(reference=drift_reference)
+
+    def retrain_signals(self):
+        """
+        Return a dict of model name -> list of reasons it should be retrained
+        """
+        signals = {'aqi': [], 'outage': []}
+
+        if not self.aqi.simulated and self.aqi.count >= MIN_SAMPLES and self.aqi.accuracy < MIN_ACCURACY:
+            signals['aqi'].append(f"Accuracy {self.aqi.accuracy:.1%} below {MIN_ACCURACY:.0%}")
+        for segment, features in self.drift.summary().items():
+            prefix = f"{segment} " if segment is not None else ""
+            for feature, stats in features.items():
+                if stats['samples'] < MIN_SAMPLES:
+                    continue
+                if stats['psi'] > PSI_THRESHOLD:
+                    signals['aqi'].append(f"{prefix}{feature} PSI {stats['psi']:.2f} above {PSI_THRESHOLD}")
+                elif stats['ks'] > KS_THRESHOLD:
+                    signals['aqi'].append(f"{prefix}{feature} KS {stats['ks']:.2f} above {KS_THRESHOLD}")
+
+        if not self.outage.simulated and self.outage.count >= MIN_SAMPLES and self.outage.mae > MAX_MAE_HOURS:
+            signals['outage'].append(f"MAE {self.outage.mae:.1f}h above {MAX_MAE_HOURS}h")
+
+        return {model: reasons for model, reasons in signals.items() if reasons}